@@ -1,22 +1,60 @@
 # dataset/cli/ontology_analyze.py
 from __future__ import annotations
 
+import heapq
 import logging
+import os
 import yaml
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, DefaultDict, Dict, Iterator, List, Optional, Set, Tuple
 
 import typer
-from rdflib import Graph, URIRef
-from rdflib.namespace import RDF, RDFS, OWL, DC, DCTERMS, split_uri
+from rdflib import Graph, Node, URIRef
+from rdflib.namespace import RDF, RDFS, OWL, DC, DCTERMS
 from xml.etree import ElementTree as ET
-import re
 
-from celine.ontologies.utils import setup_cli_logging, write_yaml_file
+from celine.ontologies.utils import (
+    YamlLoader,
+    file_suffix,
+    rdf_store,
+    setup_cli_logging,
+    write_json_file,
+    write_yaml_file,
+)
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_SUFFIXES = frozenset(
+    {
+        ".ttl",
+        ".rdf",
+        ".owl",
+        ".xml",
+        ".xsd",
+        ".nt",
+        ".n3",
+        ".trig",
+        ".jsonld",
+        ".rj",
+    }
+)
+
+# Quote escaping for Graphviz DOT labels
+_DOT_ESCAPE = str.maketrans({'"': '\\"'})
+
+# Number of entries kept in each ranking of the result document
+RANKING_TOP_K = 100
+
+XSD_IMPORT_TAG = "{http://www.w3.org/2001/XMLSchema}import"
+XSD_NS_QUOTED = b'"http://www.w3.org/2001/XMLSchema"'
+
+# Sentinel for namespace cache misses (None is a valid cached value)
+_MISS = object()
+
 ontology_analyze_app = typer.Typer(
     name="ontology-analyze",
     help="Analyze ontology directory and build a cross-ontology dependency graph.",
@@ -45,7 +83,7 @@ def normalize_ns(ns: str | None) -> Optional[str]:
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class OntologyStats:
     namespace: str
     files: Set[str] = field(default_factory=set)
@@ -64,28 +102,43 @@ class OntologyAnalyzer:
     while processing multiple RDF / XSD files.
     """
 
-    CLASS_TYPES = {OWL.Class, RDFS.Class}
-    PROPERTY_TYPES = {
-        RDF.Property,
-        OWL.ObjectProperty,
-        OWL.DatatypeProperty,
-        OWL.AnnotationProperty,
-        OWL.OntologyProperty,
-    }
-    DEP_PREDICATES = {
-        RDFS.subClassOf,
-        RDFS.subPropertyOf,
-        OWL.equivalentClass,
-        OWL.equivalentProperty,
-        OWL.sameAs,
-        OWL.inverseOf,
-        RDFS.seeAlso,
-    }
+    CLASS_TYPES = frozenset({OWL.Class, RDFS.Class})
+    PROPERTY_TYPES = frozenset(
+        {
+            RDF.Property,
+            OWL.ObjectProperty,
+            OWL.DatatypeProperty,
+            OWL.AnnotationProperty,
+            OWL.OntologyProperty,
+        }
+    )
+    DEP_PREDICATES = frozenset(
+        {
+            RDFS.subClassOf,
+            RDFS.subPropertyOf,
+            OWL.equivalentClass,
+            OWL.equivalentProperty,
+            OWL.sameAs,
+            OWL.inverseOf,
+            RDFS.seeAlso,
+        }
+    )
+    # Ontology-level annotations, in order of preference
+    LABEL_PREDICATES = (RDFS.label, DCTERMS.title, DC.title)
+    DESCRIPTION_PREDICATES = (DCTERMS.description, RDFS.comment, DC.description)
+    ANNOTATION_PREDICATES = frozenset({*LABEL_PREDICATES, *DESCRIPTION_PREDICATES})
+    # Predicates that need handling beyond the per-triple namespace bookkeeping
+    INTERESTING_PREDICATES = frozenset(
+        {RDF.type, OWL.imports, *DEP_PREDICATES, *ANNOTATION_PREDICATES}
+    )
 
     def __init__(self) -> None:
         self.namespaces: Dict[str, OntologyStats] = {}
-        self.references: Dict[str, Dict[str, int]] = {}
-        self.imports: Dict[str, Set[str]] = {}
+        self.references: DefaultDict[str, Counter[str]] = defaultdict(Counter)
+        self.imports: DefaultDict[str, Set[str]] = defaultdict(set)
+        self._ns_cache: Dict[Node, Optional[str]] = {}
+        self._ontologies: Set[Node] = set()
+        self._annotations: Dict[Node, Dict[Node, Any]] = {}
 
     # ------------------------ Core helpers ------------------------ #
 
@@ -97,31 +150,37 @@ class OntologyAnalyzer:
             self.namespaces[ns] = OntologyStats(namespace=ns)
         return self.namespaces[ns]
 
-    @staticmethod
-    def _get_namespace(node: URIRef) -> Optional[str]:
+    def _get_namespace(self, node: Any) -> Optional[str]:
         if not isinstance(node, URIRef):
             return None
+        return self._uri_namespace(node)
+
+    def _uri_namespace(self, node: Node) -> Optional[str]:
+        """Cached namespace lookup for a node already known to be a URIRef."""
+        ns = self._ns_cache.get(node, _MISS)
+        if ns is _MISS:
+            ns = self._split_namespace(node)
+            self._ns_cache[node] = ns
+        return ns  # type: ignore[return-value]
+
+    @staticmethod
+    def _split_namespace(node: Node) -> Optional[str]:
         uri_str = str(node)
-        try:
-            ns, _ = split_uri(node)
-            return normalize_ns(str(ns))
-        except Exception:
-            if "#" in uri_str:
-                return normalize_ns(uri_str.rsplit("#", 1)[0])
-            if "/" in uri_str:
-                return normalize_ns(uri_str.rsplit("/", 1)[0])
-        return None
+        i = uri_str.rfind("#")
+        if i < 0:
+            i = uri_str.rfind("/")
+            if i < 0:
+                return None
+        return uri_str[:i].rstrip("/#") or None
 
     def _register_reference(
-        self, raw_src: str | None, raw_dst: str | None, weight: int = 1
+        self, src: str | None, dst: str | None, weight: int = 1
     ) -> None:
-        src = normalize_ns(raw_src)
-        dst = normalize_ns(raw_dst)
+        # Callers pass namespaces already normalized
         if not src or not dst or src == dst:
             return
 
-        self.references.setdefault(src, {})
-        self.references[src][dst] = self.references[src].get(dst, 0) + weight
+        self.references[src][dst] += weight
 
     def _register_import(self, raw_src: str | None, raw_dst: str | None) -> None:
         src = normalize_ns(raw_src)
@@ -129,30 +188,45 @@ class OntologyAnalyzer:
         if not src or not dst or src == dst:
             return
 
-        self.imports.setdefault(src, set()).add(dst)
+        self.imports[src].add(dst)
         self._register_reference(src, dst, weight=1)
 
     # ------------------------ RDF processing ------------------------ #
 
     def process_rdf_graph(self, file_path: Path, g: Graph) -> None:
         file_str = str(file_path)
+        file_ontologies: List[Node] = []
+        file_imports: Dict[Node, List[Node]] = {}
+
+        # Iterate the store directly, skipping Graph.triples' wrapper generator
+        for (s, p, o), _ in g.store.triples((None, None, None), context=g):
+            # Everything below is keyed on the subject: blank-node subjects
+            # carry no namespace information at all.
+            if not isinstance(s, URIRef):
+                continue
+
+            s_ns = self._uri_namespace(s)
+            p_ns = self._uri_namespace(p)
+
+            if s_ns:
+                stats = self._ensure_ns(s_ns)
+                stats.files.add(file_str)
+                stats.triples += 1
+
+                # Subject uses foreign property
+                if p_ns and s_ns != p_ns:
+                    self._register_reference(s_ns, p_ns)
+
+            # Most triples use predicates we have no further interest in
+            if p not in self.INTERESTING_PREDICATES:
+                continue
+
+            o_is_uri = isinstance(o, URIRef)
+            o_ns = self._uri_namespace(o) if o_is_uri else None
 
-        for s, p, o in g:
-            s_ns = None
-
-            if isinstance(s, URIRef):
-                s_ns = self._get_namespace(s)
-                if s_ns:
-                    stats = self._ensure_ns(s_ns)
-                    stats.files.add(file_str)
-                    stats.triples += 1
-
-            # Classification
-            if p == RDF.type and isinstance(s, URIRef) and isinstance(o, URIRef):
-                s_ns = self._get_namespace(s)
-                o_ns = self._get_namespace(o)
-                if s_ns:
-                    stats = self._ensure_ns(s_ns)
+            if p == RDF.type:
+                # Classification
+                if s_ns and o_is_uri:
                     if o in self.CLASS_TYPES:
                         stats.classes += 1
                     elif o in self.PROPERTY_TYPES:
@@ -160,58 +234,70 @@ class OntologyAnalyzer:
                     else:
                         stats.individuals += 1
 
-            # Cross-namespace references
-            self._process_dependencies_for_triple(s, p, o)
+                if o == OWL.Ontology:
+                    file_ontologies.append(s)
 
-        # owl:imports
-        for onto in g.subjects(RDF.type, OWL.Ontology):
-            if not isinstance(onto, URIRef):
-                continue
-            onto_ns = self._get_namespace(onto)
-            stats = self._ensure_ns(onto_ns)
-            stats.files.add(file_str)
+                # rdf:type referencing a foreign class
+                self._register_reference(s_ns, o_ns)
 
-            for imported in g.objects(onto, OWL.imports):
-                if isinstance(imported, URIRef):
-                    imp_ns = self._get_namespace(imported)
-                    self._ensure_ns(imp_ns)
-                    self._register_import(onto_ns, imp_ns)
+            elif p in self.DEP_PREDICATES:
+                # subclass, equivalent, sameAs etc.
+                self._register_reference(s_ns, o_ns)
 
-    def _process_dependencies_for_triple(self, s: Any, p: Any, o: Any) -> None:
-        s_ns = self._get_namespace(s) if isinstance(s, URIRef) else None
-        p_ns = self._get_namespace(p) if isinstance(p, URIRef) else None
-        o_ns = self._get_namespace(o) if isinstance(o, URIRef) else None
+            elif p == OWL.imports:
+                if o_is_uri:
+                    file_imports.setdefault(s, []).append(o)
 
-        # Subject uses foreign property
-        if s_ns and p_ns and s_ns != p_ns:
-            self._register_reference(s_ns, p_ns)
+            elif p in self.ANNOTATION_PREDICATES:
+                self._annotations.setdefault(s, {}).setdefault(p, o)
 
-        # rdf:type
-        if p == RDF.type and s_ns and o_ns and s_ns != o_ns:
-            self._register_reference(s_ns, o_ns)
+        # owl:imports
+        for onto in file_ontologies:
+            self._ontologies.add(onto)
+            onto_ns = self._get_namespace(onto)
+            stats = self._ensure_ns(onto_ns)
+            stats.files.add(file_str)
 
-        # subclass, equivalent, sameAs etc.
-        if p in self.DEP_PREDICATES and s_ns and o_ns and s_ns != o_ns:
-            self._register_reference(s_ns, o_ns)
+            for imported in file_imports.get(onto, []):
+                imp_ns = self._get_namespace(imported)
+                self._ensure_ns(imp_ns)
+                self._register_import(onto_ns, imp_ns)
 
     # ------------------------ XSD processing ------------------------ #
 
     def process_xsd(self, file_path: Path) -> None:
+        # Stream the document: only the root targetNamespace and the
+        # xs:import attributes are needed, so elements are dropped once
+        # closed and detached from the root, keeping memory O(depth).
+        tns: Optional[str] = None
+        imported: List[Optional[str]] = []
         try:
-            tree = ET.parse(file_path)
+            root: Optional[ET.Element] = None
+            depth = 0
+            for event, elem in ET.iterparse(file_path, events=("start", "end")):
+                if event == "end":
+                    depth -= 1
+                    elem.clear()
+                    if depth == 1 and root is not None:
+                        root.clear()
+                    continue
+
+                depth += 1
+                if root is None:
+                    root = elem
+                    tns = elem.attrib.get("targetNamespace")
+                elif elem.tag == XSD_IMPORT_TAG:
+                    imported.append(elem.attrib.get("namespace"))
         except Exception as exc:
             logger.warning("Failed to parse XSD %s: %s", file_path, exc)
             return
 
-        root = tree.getroot()
-        tns = root.attrib.get("targetNamespace")
         tns = normalize_ns(tns) or f"file://{file_path.name}"
 
         src_stats = self._ensure_ns(tns)
         src_stats.files.add(str(file_path))
 
-        for elem in root.findall(".//{http://www.w3.org/2001/XMLSchema}import"):
-            ns = elem.attrib.get("namespace")
+        for ns in imported:
             ns = normalize_ns(ns)
             if ns:
                 self._ensure_ns(ns)
@@ -219,28 +305,29 @@ class OntologyAnalyzer:
 
     # ------------------------ Descriptions ------------------------ #
 
-    def attach_descriptions_from_graph(self, merged_graph: Graph) -> None:
-        for onto in merged_graph.subjects(RDF.type, OWL.Ontology):
-            if not isinstance(onto, URIRef):
-                continue
+    def attach_descriptions(self) -> None:
+        """
+        Fill ontology labels / descriptions from the annotations collected
+        while processing the RDF graphs.
+        """
+        for onto in self._ontologies:
             ns = self._get_namespace(onto)
             stats = self._ensure_ns(ns)
+            annotations = self._annotations.get(onto)
+            if not annotations:
+                continue
 
-            labels = (
-                list(merged_graph.objects(onto, RDFS.label))
-                or list(merged_graph.objects(onto, DCTERMS.title))
-                or list(merged_graph.objects(onto, DC.title))
-            )
-            if labels and not stats.label:
-                stats.label = str(labels[0])
+            if not stats.label:
+                for pred in self.LABEL_PREDICATES:
+                    if pred in annotations:
+                        stats.label = str(annotations[pred])
+                        break
 
-            descs = (
-                list(merged_graph.objects(onto, DCTERMS.description))
-                or list(merged_graph.objects(onto, RDFS.comment))
-                or list(merged_graph.objects(onto, DC.description))
-            )
-            if descs and not stats.description:
-                stats.description = str(descs[0])
+            if not stats.description:
+                for pred in self.DESCRIPTION_PREDICATES:
+                    if pred in annotations:
+                        stats.description = str(annotations[pred])
+                        break
 
     # ------------------------ Finalization / export ------------------------ #
 
@@ -252,12 +339,12 @@ class OntologyAnalyzer:
         last = s.split("/")[-1].split("#")[-1]
         return last.lower().replace("-", "_").replace(".", "_") or f"ns{fallback_index}"
 
-    def _build_id_map(self, merged_graph: Graph) -> Dict[str, str]:
+    def _build_id_map(self, graph: Graph) -> Dict[str, str]:
         id_map: Dict[str, str] = {}
         ns_list = sorted(self.namespaces.keys())
 
         # 1) Use RDF prefixes
-        for prefix, ns in merged_graph.namespace_manager.namespaces():
+        for prefix, ns in graph.namespace_manager.namespaces():
             ns_str = normalize_ns(str(ns))
             if ns_str and ns_str in self.namespaces and ns_str not in id_map:
                 id_map[ns_str] = prefix
@@ -271,22 +358,30 @@ class OntologyAnalyzer:
 
         return id_map
 
-    def build_result_document(self, merged_graph: Graph) -> Dict[str, Any]:
-        self.attach_descriptions_from_graph(merged_graph)
-
-        id_map = self._build_id_map(merged_graph)
-
-        # incoming
-        incoming = {ns: 0 for ns in self.namespaces}
+    def build_result_document(
+        self, graph: Graph, keep: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the analysis document. When `keep` is given, only those
+        namespaces (and edges between them) are listed as nodes / edges;
+        rankings and reference counts still cover every namespace.
+        """
+        self.attach_descriptions()
+
+        id_map = self._build_id_map(graph)
+        keep_ids = None if keep is None else {id_map[ns] for ns in keep}
+
+        # incoming / outgoing, in a single sweep over the references
+        incoming = dict.fromkeys(self.namespaces, 0)
+        outgoing = dict.fromkeys(self.namespaces, 0)
         for src, targets in self.references.items():
+            total = 0
             for dst, count in targets.items():
+                total += count
                 if dst in incoming:
                     incoming[dst] += count
-
-        # outgoing
-        outgoing = {
-            ns: sum(self.references.get(ns, {}).values()) for ns in self.namespaces
-        }
+            if src in outgoing:
+                outgoing[src] = total
 
         # Nodes
         nodes: List[Dict[str, Any]] = []
@@ -303,7 +398,7 @@ class OntologyAnalyzer:
                     "properties": stats.properties,
                     "individuals": stats.individuals,
                     "files": sorted(stats.files),
-                    "imports": sorted(self.imports.get(ns, set())),
+                    "imports": sorted(self.imports.get(ns, ())),
                     "incoming_references": incoming.get(ns, 0),
                     "outgoing_references": outgoing.get(ns, 0),
                 }
@@ -314,11 +409,11 @@ class OntologyAnalyzer:
 
         for src_ns, targets in self.references.items():
             src_id = id_map.get(src_ns)
-            if not src_id:
+            if not src_id or (keep_ids is not None and src_id not in keep_ids):
                 continue
             for dst_ns, ref_count in targets.items():
                 dst_id = id_map.get(dst_ns)
-                if not dst_id:
+                if not dst_id or (keep_ids is not None and dst_id not in keep_ids):
                     continue
                 key = (src_id, dst_id)
                 edge = edge_map.setdefault(
@@ -334,11 +429,11 @@ class OntologyAnalyzer:
 
         for src_ns, dst_set in self.imports.items():
             src_id = id_map.get(src_ns)
-            if not src_id:
+            if not src_id or (keep_ids is not None and src_id not in keep_ids):
                 continue
             for dst_ns in dst_set:
                 dst_id = id_map.get(dst_ns)
-                if not dst_id:
+                if not dst_id or (keep_ids is not None and dst_id not in keep_ids):
                     continue
                 key = (src_id, dst_id)
                 edge = edge_map.setdefault(
@@ -355,16 +450,18 @@ class OntologyAnalyzer:
         edges = list(edge_map.values())
 
         # Rankings
-        most_referenced = sorted(
-            nodes, key=lambda n: n["incoming_references"], reverse=True
+        most_referenced = heapq.nlargest(
+            RANKING_TOP_K, nodes, key=lambda n: n["incoming_references"]
         )
-        largest_consumers = sorted(
-            nodes, key=lambda n: n["outgoing_references"], reverse=True
+        largest_consumers = heapq.nlargest(
+            RANKING_TOP_K, nodes, key=lambda n: n["outgoing_references"]
         )
 
+        kept_nodes = nodes if keep is None else [n for n in nodes if n["namespace"] in keep]
+
         return {
-            "ontologies": nodes,
-            "graph": {"nodes": nodes, "edges": edges},
+            "ontologies": kept_nodes,
+            "graph": {"nodes": kept_nodes, "edges": edges},
             "ranking": {
                 "most_referenced": [
                     {
@@ -417,68 +514,74 @@ def matches_keywords(metadata: Dict[str, Any], patterns: List[str]) -> bool:
     return all(i in kws for i in includes) and not any(e in excludes for e in kws)
 
 
-def _load_metadata_for_file(file_path: Path) -> Optional[Dict[str, Any]]:
-    meta_path = file_path.parent / "metadata.yaml"
-    if not meta_path.exists():
+@lru_cache(maxsize=None)
+def _load_metadata_cached(meta_path: str) -> Optional[Dict[str, Any]]:
+    path = Path(meta_path)
+    if not path.exists():
         return None
     try:
-        with meta_path.open("r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        with path.open("r", encoding="utf-8") as f:
+            return yaml.load(f, Loader=YamlLoader) or {}
     except Exception as exc:
-        logger.warning("Failed to load metadata for %s: %s", file_path, exc)
+        logger.warning("Failed to load metadata %s: %s", path, exc)
         return None
 
 
-def _iter_files(input_dir: Path) -> List[Path]:
-    files: List[Path] = []
-    for path in input_dir.rglob("*"):
-        if not path.is_file():
-            continue
+def _load_metadata_for_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    # Files in the same folder share one metadata.yaml: parse it only once
+    return _load_metadata_cached(str(file_path.parent / "metadata.yaml"))
 
-        if path.suffix.lower() in {
-            ".ttl",
-            ".rdf",
-            ".owl",
-            ".xml",
-            ".xsd",
-            ".nt",
-            ".n3",
-            ".trig",
-            ".jsonld",
-            ".rj",
-        }:
-            files.append(path)
-            continue
 
-        if path.suffix == "":
-            files.append(path)
-            continue
+def _walk_files(directory: str) -> Iterator[os.DirEntry[str]]:
+    # Unreadable directories are skipped, as Path.rglob does
+    try:
+        it = os.scandir(directory)
+    except OSError as exc:
+        logger.debug("Skipping unreadable directory %s: %s", directory, exc)
+        return
+
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+
+def _iter_files(input_dir: Path) -> List[Path]:
+    files: List[Path] = []
+    for entry in _walk_files(str(input_dir)):
+        suffix = file_suffix(entry.name)
+        if suffix == "" or suffix in SUPPORTED_SUFFIXES:
+            files.append(Path(entry.path))
 
     return sorted(files)
 
 
-def _load_rdf_file(path: Path, merged_graph: Graph) -> Optional[Graph]:
-    g = Graph()
+def _parse_to_ntriples(path: Path) -> Tuple[Path, Optional[bytes], Optional[str]]:
+    """
+    Parse a single RDF file and return it serialized as N-Triples.
+
+    Runs in a worker process, so the result is returned as bytes rather
+    than as a Graph. The third element is the format that succeeded
+    ("auto" for rdflib auto-detection), or None if nothing worked.
+    """
+    g = Graph(store=rdf_store())
     try:
         g.parse(path)
-        merged_graph += g
-        logger.info("Parsed %s via auto-detection", path)
-        return g
+        return path, g.serialize(format="nt", encoding="utf-8"), "auto"
     except Exception:
         pass
 
     for fmt in ["turtle", "xml", "n3", "nt", "trig"]:
         try:
-            g = Graph()
+            g = Graph(store=rdf_store())
             g.parse(path, format=fmt)
-            merged_graph += g
-            logger.info("Parsed %s as %s", path, fmt)
-            return g
+            return path, g.serialize(format="nt", encoding="utf-8"), fmt
         except Exception:
             continue
 
-    logger.warning("Could not parse %s in any RDF format", path)
-    return None
+    return path, None, None
 
 
 def _looks_like_xsd(path: Path) -> bool:
@@ -487,15 +590,16 @@ def _looks_like_xsd(path: Path) -> bool:
 
     if path.suffix == "":
         try:
-            with path.open("r", encoding="utf-8", errors="ignore") as f:
-                first_kb = f.read(1024)
-            xsd_schema_pattern = re.compile(
-                r'.*<\s*[^>]*schema\b[^>]*"http:\/\/www\.w3\.org\/2001\/XMLSchema"\s*>.*',
-                re.IGNORECASE,
-            )
-            return bool(xsd_schema_pattern.search(first_kb))
-        except Exception:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                first_kb = os.read(fd, 1024)
+            finally:
+                os.close(fd)
+        except OSError:
             return False
+        # A <...schema ... "http://www.w3.org/2001/XMLSchema"> root element
+        i = first_kb.find(XSD_NS_QUOTED)
+        return i >= 0 and b"schema" in first_kb[:i].lower()
 
     return False
 
@@ -503,32 +607,34 @@ def _looks_like_xsd(path: Path) -> bool:
 def write_graphviz_dot(
     path: Path, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]
 ) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        f.write("digraph ontologies {\n")
-
-        for node in nodes:
-            node_id = node["id"]
-            label = node.get("label") or node_id
-            ns = node.get("namespace", "")
-            full_label = f"{label}\\n{ns}".replace('"', '\\"')
-            f.write(f'  "{node_id}" [label="{full_label}"];\n')
-
-        for edge in edges:
-            src = edge["source"]
-            dst = edge["target"]
-            parts = []
-            if edge.get("import"):
-                parts.append("import")
-            if edge.get("reference_count", 0):
-                parts.append(f"refs={edge['reference_count']}")
-            label = " / ".join(parts)
-            if label:
-                f.write(f'  "{src}" -> "{dst}" [label="{label}"];\n')
-            else:
-                f.write(f'  "{src}" -> "{dst}";\n')
+    # Build the whole document in memory and write it in one go
+    out = ["digraph ontologies {\n"]
+
+    for node in nodes:
+        node_id = node["id"]
+        label = node.get("label") or node_id
+        ns = node.get("namespace", "")
+        full_label = f"{label}\\n{ns}".translate(_DOT_ESCAPE)
+        out.append(f'  "{node_id}" [label="{full_label}"];\n')
+
+    for edge in edges:
+        src = edge["source"]
+        dst = edge["target"]
+        parts = []
+        if edge.get("import"):
+            parts.append("import")
+        if edge.get("reference_count", 0):
+            parts.append(f"refs={edge['reference_count']}")
+        label = " / ".join(parts)
+        if label:
+            out.append(f'  "{src}" -> "{dst}" [label="{label}"];\n')
+        else:
+            out.append(f'  "{src}" -> "{dst}";\n')
 
-        f.write("}\n")
+    out.append("}\n")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(out), encoding="utf-8")
 
     logger.info("Wrote Graphviz DOT to %s", path)
 
@@ -560,25 +666,40 @@ def analyze_ontologies(
 
     logger.info("Found %d candidate ontology files in %s", len(files), input_dir)
 
-    merged_graph = Graph()
+    _load_metadata_cached.cache_clear()
     analyzer = OntologyAnalyzer()
 
     metadata_by_file: Dict[Path, Dict[str, Any]] = {}
     metadata_by_ns: Dict[str, Dict[str, Any]] = {}
 
+    rdf_files: List[Path] = []
     for f in files:
-        logger.info("Processing %s", f)
-
         meta = _load_metadata_for_file(f)
         if meta:
             metadata_by_file[f] = meta
 
         if _looks_like_xsd(f):
+            logger.info("Processing %s", f)
             analyzer.process_xsd(f)
             continue
 
-        rdf_graph = _load_rdf_file(f, merged_graph)
-        if rdf_graph:
+        rdf_files.append(f)
+
+    # RDF parsing is CPU-bound pure Python: fan it out across processes and
+    # reload the N-Triples output here, which is much cheaper to parse.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for f, nt_bytes, fmt in ex.map(_parse_to_ntriples, rdf_files):
+            logger.info("Processing %s", f)
+            if nt_bytes is None:
+                logger.warning("Could not parse %s in any RDF format", f)
+                continue
+
+            if fmt == "auto":
+                logger.info("Parsed %s via auto-detection", f)
+            else:
+                logger.info("Parsed %s as %s", f, fmt)
+
+            rdf_graph = Graph(store=rdf_store()).parse(data=nt_bytes, format="nt")
             analyzer.process_rdf_graph(f, rdf_graph)
 
     # Map metadata.yaml to namespaces
@@ -589,31 +710,26 @@ def analyze_ontologies(
                 metadata_by_ns[ns] = metadata_by_file[fp]
                 break
 
-    result_doc = analyzer.build_result_document(merged_graph)
-
     # Keyword filtering
+    keep_ns: Optional[Set[str]] = None
     if keywords:
         logger.info("Applying keyword filters: %s", keywords)
+        keep_ns = {
+            ns
+            for ns in analyzer.namespaces
+            if matches_keywords(metadata_by_ns.get(ns) or {}, keywords)
+        }
 
-        def ok(node):
-            ns = node["namespace"]
-            meta = metadata_by_ns.get(ns) or {}
-            return matches_keywords(meta, keywords)
-
-        filtered_nodes = [n for n in result_doc["graph"]["nodes"] if ok(n)]
-        keep_ids = {n["id"] for n in filtered_nodes}
-
-        filtered_edges = [
-            e
-            for e in result_doc["graph"]["edges"]
-            if e["source"] in keep_ids and e["target"] in keep_ids
-        ]
-
-        result_doc["graph"]["nodes"] = filtered_nodes
-        result_doc["graph"]["edges"] = filtered_edges
-        result_doc["ontologies"] = filtered_nodes
+    # Only prefix bindings are read from the graph, and N-Triples carries
+    # none over: an empty graph with rdflib's default bindings is enough,
+    # no merged copy of every file's triples is kept.
+    result_doc = analyzer.build_result_document(Graph(store=rdf_store()), keep=keep_ns)
 
-    write_yaml_file(output_file, result_doc)
+    # JSON is much cheaper to emit than YAML for large node / edge lists
+    if output_file.suffix.lower() == ".json":
+        write_json_file(output_file, result_doc)
+    else:
+        write_yaml_file(output_file, result_doc)
     logger.info("Ontology analysis written to %s", output_file)
 
     if graphviz_out:
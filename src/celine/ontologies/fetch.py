@@ -1,16 +1,23 @@
 # dataset/cli/ontology_fetch.py
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import uuid
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import httpx
 import typer
 import yaml
 
-from celine.ontologies.utils import setup_cli_logging
+from celine.ontologies.utils import YamlDumper, YamlLoader, setup_cli_logging
 
 logger = logging.getLogger(__name__)
+
+# Upper bound on in-flight downloads
+MAX_CONCURRENT_DOWNLOADS = 16
+
 ontology_app = typer.Typer(
     name="ontology", help="Download ontology definitions with keyword filters."
 )
@@ -76,7 +83,7 @@ def _write_metadata_file(
     outfile = subdir / "metadata.yaml"
     try:
         with outfile.open("w", encoding="utf-8") as f:
-            yaml.safe_dump(meta, f, sort_keys=False, allow_unicode=True)
+            yaml.dump(meta, f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
         logger.info("Wrote metadata → %s", outfile)
     except Exception as exc:
         logger.error("Failed to write metadata %s: %s", outfile, exc)
@@ -93,16 +100,58 @@ def safe_name(name: str) -> str:
     )
 
 
-def download_file(url: str) -> tuple[bytes, httpx.URL]:
-    with httpx.Client(timeout=20.0, follow_redirects=True) as client:
-        resp = client.get(url)
-        resp.raise_for_status()
-        return (resp.content, resp.url)
+async def _download(
+    client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str, subdir: Path
+) -> str:
+    """
+    Stream one definition into `subdir` and return its file name, so no
+    response body is held in memory. The body goes to a private temporary
+    file that only replaces the target once complete: concurrent
+    downloads resolving to the same name never mix their bytes, and a
+    failed one leaves any existing file in place.
+    """
+    async with sem:
+        logger.debug("Downloading %s", url)
+        async with client.stream("GET", url) as resp:
+            resp.raise_for_status()
+            fname = resp.url.path.split("/")[-1] or "definition"
+            outfile = subdir / fname
+            tmp = subdir / f".{fname}.{uuid.uuid4().hex}.part"
+            try:
+                with tmp.open("xb") as f:
+                    async for chunk in resp.aiter_bytes():
+                        f.write(chunk)
+                os.replace(tmp, outfile)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+
+    logger.info("→ Saved %s", outfile)
+    return fname
+
+
+async def _download_all(
+    downloads: List[tuple[str, Path]],
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> List[str | BaseException]:
+    """
+    Download all (url, target folder) pairs concurrently over a single
+    shared client. Failures are returned in place of the file name
+    instead of raised.
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    async with httpx.AsyncClient(
+        timeout=20.0, follow_redirects=True, transport=transport
+    ) as client:
+        return await asyncio.gather(
+            *(_download(client, sem, url, subdir) for url, subdir in downloads),
+            return_exceptions=True,
+        )
 
 
 def load_ontologies(path: Path) -> List[Dict[str, Any]]:
     with path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=YamlLoader) or {}
     return data.get("ontologies") or []
 
 
@@ -134,13 +183,22 @@ def fetch_ontologies(
     filtered = [o for o in onts if matches_keywords(o, keywords or [])]
     logger.info("Selected %d ontologies after filtering", len(filtered))
 
+    subdirs: List[Path] = []
+    downloads: List[tuple[str, Path]] = []
     for ont in filtered:
+        subdir = output_dir / safe_name(ont.get("name") or "unknown")
+        subdir.mkdir(parents=True, exist_ok=True)
+        subdirs.append(subdir)
+        downloads.extend((url, subdir) for url in ont.get("definitions") or [])
+
+    # Files are written as each download completes
+    logger.info("Downloading %d definitions", len(downloads))
+    results = iter(asyncio.run(_download_all(downloads)))
+
+    for ont, subdir in zip(filtered, subdirs):
         name = ont.get("name") or "unknown"
         defs = ont.get("definitions") or []
 
-        subdir = output_dir / safe_name(name)
-        subdir.mkdir(parents=True, exist_ok=True)
-
         if not defs:
             logger.warning(
                 "Ontology '%s' has no definitions. Skipping downloads.", name
@@ -148,27 +206,16 @@ def fetch_ontologies(
             _write_metadata_file(subdir, ont, downloaded=[])
             continue
 
-        logger.info("Downloading %d definitions for %s", len(defs), name)
         downloaded_files: List[str] = []
 
         for url in defs:
-            try:
-                logger.debug("Downloading %s", url)
-                content, resolved_url = download_file(url)
-            except Exception as exc:
-                logger.error("Failed to download %s: %s", url, exc)
+            result = next(results)
+            if isinstance(result, BaseException):
+                logger.error("Failed to download %s: %s", url, result)
                 continue
+            downloaded_files.append(result)
 
-            fname = resolved_url.path.split("/")[-1] or "definition"
-            outfile = subdir / fname
-
-            try:
-                outfile.write_bytes(content)
-                downloaded_files.append(fname)
-                logger.info("→ Saved %s", outfile)
-            except Exception as exc:
-                logger.error("Failed to save %s: %s", outfile, exc)
-                continue
+        logger.info("Saved %d/%d definitions for %s", len(downloaded_files), len(defs), name)
 
         # ✨ NEW: write metadata.yaml referencing the ontology catalogue entry
         _write_metadata_file(subdir, ont, downloaded_files)
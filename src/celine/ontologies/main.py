@@ -43,7 +43,10 @@ def cmd_analyze_ontologies(
         Path(REPO_ROOT / "data/ontologies"), "--input", "-i"
     ),
     output_file: Path = typer.Option(
-        Path(REPO_ROOT / "data/ontologies/ontology-graph.yaml"), "--output", "-o"
+        Path(REPO_ROOT / "data/ontologies/ontology-graph.yaml"),
+        "--output",
+        "-o",
+        help="Output file; written as JSON if it ends in .json, YAML otherwise",
     ),
     graphviz_out: Optional[Path] = typer.Option(
         Path(REPO_ROOT / "data/ontologies/ontology-graph.dot"), "--graphviz"
@@ -68,12 +71,18 @@ def cmd_ontology_tree(
     folder: Optional[List[str]] = typer.Option(
         None, "--folder", "-f", help="Fuzzy folder-name filter (multiple allowed)"
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Rebuild every tree, ignoring parse caches and up-to-date outputs",
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v"),
 ):
     generate_ontology_tree(
         ontologies_dir=ontologies_dir,
         folder_filters=folder,
         verbose=verbose,
+        use_cache=not no_cache,
     )
 
 
@@ -1,29 +1,83 @@
 from __future__ import annotations
 
+import json
 import logging
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import DefaultDict, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
 import typer
-from rdflib import Graph, Node, URIRef
+from rdflib import BNode, Graph, Literal, Node, URIRef
 from rdflib.namespace import RDF, RDFS, OWL, DCTERMS
+from rdflib.plugins.parsers.ntriples import unquote
 
-from celine.ontologies.utils import setup_cli_logging, write_yaml_file
+from celine.ontologies.utils import (
+    file_suffix,
+    rdf_store,
+    setup_cli_logging,
+    write_json_file,
+    write_yaml_sections,
+)
 
 logger = logging.getLogger(__name__)
 
-SUPPORTED_SUFFIXES = {
-    ".ttl",
-    ".rdf",
-    ".owl",
-    ".xml",
-    ".nt",
-    ".n3",
-    ".trig",
-    ".jsonld",
-    ".rj",
+SUFFIX_TO_FORMAT: Dict[str, str] = {
+    ".ttl": "turtle",
+    ".nt": "nt",
+    ".n3": "n3",
+    ".trig": "trig",
+    ".jsonld": "json-ld",
+    ".rj": "json-ld",
+    ".rdf": "xml",
+    ".owl": "xml",
+    ".xml": "xml",
 }
 
+SUPPORTED_SUFFIXES = set(SUFFIX_TO_FORMAT)
+
+# Suffix appended to source file names for their N-Triples parse cache
+CACHE_SUFFIX = ".nt.cache"
+
+# One N-Triples statement: subject, predicate, object (IRI, blank node or
+# literal with optional language tag / datatype), optional trailing comment
+_NT_LINE = re.compile(
+    r'(?:<([^>\\]*)>|_:(\S+))\s*<([^>\\]*)>\s*'
+    r'(?:<([^>\\]*)>|_:(\S+)|"((?:[^"\\]|\\.)*)"'
+    r'(?:@([a-zA-Z]+(?:-[a-zA-Z0-9]+)*)|\^\^<([^>\\]*)>)?)'
+    r"\s*\.\s*(?:#.*)?"
+)
+
+LABEL_PREDICATES = (RDFS.label, DCTERMS.title)
+COMMENT_PREDICATES = (RDFS.comment, DCTERMS.description)
+
+PROPERTY_TYPES = frozenset(
+    {
+        RDF.Property,
+        OWL.ObjectProperty,
+        OWL.DatatypeProperty,
+        OWL.AnnotationProperty,
+    }
+)
+
+# Top-level sections of ontology-tree.yaml, in output order
+TREE_SECTIONS = ("classes", "properties", "individuals")
+
+# Predicates read for the tree; every other triple is ignored
+TREE_PREDICATES = frozenset(
+    {
+        RDF.type,
+        RDFS.subClassOf,
+        RDFS.domain,
+        RDFS.range,
+        *LABEL_PREDICATES,
+        *COMMENT_PREDICATES,
+    }
+)
+
 
 def scan_folders(base: Path, patterns: Optional[List[str]]) -> List[Path]:
     """Return subdirectories matching substring filters."""
@@ -36,120 +90,446 @@ def scan_folders(base: Path, patterns: Optional[List[str]]) -> List[Path]:
     if not patterns:
         return dirs
 
-    matched: List[Path] = []
-    for d in dirs:
-        name = d.name.lower()
-        if any(p.lower() in name for p in patterns):
-            matched.append(d)
+    # One alternation tests every substring filter in a single pass
+    pattern = re.compile("|".join(re.escape(p.lower()) for p in patterns))
+    return [d for d in dirs if pattern.search(d.name.lower())]
+
+
+def rdf_format(path: Path) -> str:
+    """rdflib parser name for `path`, from its suffix."""
+    fmt = SUFFIX_TO_FORMAT.get(path.suffix.lower())
+    if fmt is None:
+        raise ValueError(f"unsupported suffix: {path.suffix}")
+    return fmt
+
+
+def _read_ntriples(path: Path) -> Optional[List[Tuple[Node, Node, Node]]]:
+    """
+    Fast N-Triples reader: one regex match per line instead of rdflib's
+    tokenizer. Returns None if any line is not recognised (e.g. escaped
+    IRIs), so the caller can fall back to the rdflib parser.
+    """
+    terms: Dict[str, URIRef] = {}
+    bnodes: Dict[str, BNode] = {}
+    triples: List[Tuple[Node, Node, Node]] = []
+
+    def uri(value: str) -> URIRef:
+        term = terms.get(value)
+        if term is None:
+            term = terms[value] = URIRef(value)
+        return term
+
+    def bnode(label: str) -> BNode:
+        node = bnodes.get(label)
+        if node is None:
+            node = bnodes[label] = BNode()
+        return node
+
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == "#":
+                continue
+            m = _NT_LINE.fullmatch(line)
+            if m is None:
+                return None
+
+            s_iri, s_bnode, p_iri, o_iri, o_bnode, lexical, lang, datatype = m.groups()
+            s = uri(s_iri) if s_iri is not None else bnode(s_bnode)
+            if o_iri is not None:
+                o: Node = uri(o_iri)
+            elif o_bnode is not None:
+                o = bnode(o_bnode)
+            else:
+                if "\\" in lexical:
+                    lexical = unquote(lexical)
+                o = Literal(lexical, lang=lang, datatype=uri(datatype) if datatype else None)
+            triples.append((s, uri(p_iri), o))
+
+    return triples
+
+
+def _new_record() -> Dict[str, Any]:
+    # Term collections are dicts used as sets, so the same triple seen in
+    # several files is only recorded once. They are sorted on output.
+    return {
+        "types": {},
+        "parents": {},
+        "domain": {},
+        "range": {},
+        "annotations": {},
+    }
 
-    return matched
 
+def _annotation_rank(value: Node) -> Tuple[bool, int, str, str]:
+    """
+    Sort key choosing one value per annotation predicate independently of
+    triple order (which varies with the store and the parse cache):
+    non-empty first, then untagged, English, other languages; ties are
+    broken on language and text.
+    """
+    lang = (getattr(value, "language", None) or "").lower()
+    if not lang:
+        rank = 0
+    elif lang == "en" or lang.startswith("en-"):
+        rank = 1
+    else:
+        rank = 2
+    text = str(value)
+    return (not text, rank, lang, text)
+
+
+def _keep_annotation(annotations: Dict[Node, Node], p: Node, o: Node) -> None:
+    current = annotations.get(p)
+    if current is None or _annotation_rank(o) < _annotation_rank(current):
+        annotations[p] = o
+
+
+def _first_annotation(
+    node: Node, annotations: Dict[Node, Node], predicates: tuple[URIRef, ...]
+) -> Optional[str]:
+    """First non-empty value among `predicates`, for URI nodes only."""
+    if not isinstance(node, URIRef):
+        return None
 
-def load_graph(files: List[Path]) -> Graph:
-    g = Graph()
+    for p in predicates:
+        val = annotations.get(p)
+        if val:
+            return str(val)
+    return None
 
-    for f in files:
-        tried = False
 
-        # Prefer safe formats
-        for fmt in ["turtle", "nt", "n3", "trig", "json-ld"]:
-            try:
-                g.parse(f, format=fmt)
-                logger.debug("Parsed %s as %s", f, fmt)
-                tried = True
-                break
-            except Exception:
-                continue
+def _tree_triples(graph: Graph) -> Iterator[Tuple[Node, Node, Node]]:
+    for pred in TREE_PREDICATES:
+        yield from graph.triples((None, pred, None))
 
-        if tried:
-            continue
 
-        # LAST RESORT: RDF/XML (generates weird warnings)
-        try:
-            g.parse(f, format="xml")
-            logger.debug("Parsed %s as xml", f)
-        except Exception:
-            logger.debug("Could not parse %s in any known format", f)
+def _add_records(
+    records: Dict[Node, Dict[str, Any]], triples: Iterable[Tuple[Node, Node, Node]]
+) -> None:
+    """Group the tree triples per subject into `records`."""
+    for s, p, o in triples:
+        rec = records[s]
+        if p == RDF.type:
+            rec["types"][o] = None
+        elif p == RDFS.subClassOf:
+            rec["parents"][o] = None
+        elif p == RDFS.domain:
+            rec["domain"][o] = None
+        elif p == RDFS.range:
+            rec["range"][o] = None
+        else:
+            _keep_annotation(rec["annotations"], p, o)
+
+
+def _merge_records(
+    records: Dict[Node, Dict[str, Any]], other: Dict[Node, Dict[str, Any]]
+) -> None:
+    for node, src in other.items():
+        rec = records[node]
+        for key in ("types", "parents", "domain", "range"):
+            rec[key].update(src[key])
+        for p, o in src["annotations"].items():
+            _keep_annotation(rec["annotations"], p, o)
 
-    return g
 
+def _collect_records(graph: Graph) -> Dict[Node, Dict[str, Any]]:
+    # Only the wanted predicates are read, each through the store's
+    # predicate index.
+    records: DefaultDict[Node, Dict[str, Any]] = defaultdict(_new_record)
+    _add_records(records, _tree_triples(graph))
+    return records
 
-def get_label(graph: Graph, node: Node) -> Optional[str]:
-    if not isinstance(node, URIRef):
+
+def _cache_path(path: Path) -> Path:
+    return path.with_name(path.name + CACHE_SUFFIX)
+
+
+def _cache_header(path: Path) -> str:
+    """First line of a cache file, tying it to the source's mtime and size."""
+    st = path.stat()
+    return f"# {CACHE_SUFFIX} mtime_ns={st.st_mtime_ns} size={st.st_size}\n"
+
+
+def _read_cache(path: Path) -> Optional[List[Tuple[Node, Node, Node]]]:
+    """Triples from the N-Triples cache of `path`, or None if missing or stale."""
+    cache = _cache_path(path)
+    try:
+        with cache.open("r", encoding="utf-8") as f:
+            if f.readline() != _cache_header(path):
+                return None
+        return _read_ntriples(cache)
+    except OSError:
         return None
 
-    for p in (RDFS.label, DCTERMS.title):
-        val = next(graph.objects(node, p), None)
-        if val:
-            return str(val)
-    return None
 
+def _write_cache(path: Path, graph: Graph, header: str) -> None:
+    cache = _cache_path(path)
+    tmp = cache.with_name(cache.name + ".tmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(header.encode("utf-8"))
+            graph.serialize(f, format="nt", encoding="utf-8")
+        os.replace(tmp, cache)
+    except OSError as exc:
+        logger.debug("Could not write parse cache %s: %s", cache, exc)
+        tmp.unlink(missing_ok=True)
+
+
+def _file_records(
+    path: Path, use_cache: bool = True
+) -> Optional[Dict[Node, Dict[str, Any]]]:
+    """
+    Parse one file and reduce it to its tree records (runs in a worker
+    process). Only the records are kept, the parsed graph is dropped.
+
+    With `use_cache`, non N-Triples files are read from a fresh
+    `<name>.nt.cache` next to them when possible, and the cache is
+    (re)written after a full parse otherwise. Files with an unsupported
+    suffix are refused before anything is read.
+    """
+    try:
+        fmt = rdf_format(path)
+    except ValueError as exc:
+        logger.error("Skipping %s: %s", path, exc)
+        return None
 
-def get_comment(graph: Graph, node: Node) -> Optional[str]:
-    if not isinstance(node, URIRef):
+    try:
+        is_nt = fmt == "nt"
+        if is_nt:
+            triples = _read_ntriples(path)
+        elif use_cache:
+            triples = _read_cache(path)
+        else:
+            triples = None
+
+        if triples is not None:
+            records: DefaultDict[Node, Dict[str, Any]] = defaultdict(_new_record)
+            _add_records(records, (t for t in triples if t[1] in TREE_PREDICATES))
+            return records
+
+        # Taken before parsing, so a file changed meanwhile is not cached as fresh
+        header = _cache_header(path) if use_cache and not is_nt else None
+
+        g = Graph(store=rdf_store())
+        g.parse(path, format=fmt)
+        if header is not None:
+            _write_cache(path, g, header)
+        return _collect_records(g)
+    except Exception:
         return None
 
-    for p in (RDFS.comment, DCTERMS.description):
-        val = next(graph.objects(node, p), None)
-        if val:
-            return str(val)
-    return None
 
+def load_records(
+    files: List[Path], use_cache: bool = True, parallel: bool = True
+) -> Dict[Node, Dict[str, Any]]:
+    """
+    Tree records for a set of files, equivalent to extracting them from
+    the merged graph of all files but without ever building that graph.
+    Files are parsed in a process pool unless `parallel` is False.
+    """
+    if parallel and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            results = list(ex.map(_file_records, files, repeat(use_cache)))
+    else:
+        results = [_file_records(f, use_cache) for f in files]
+
+    records: DefaultDict[Node, Dict[str, Any]] = defaultdict(_new_record)
+    for f, file_records in zip(files, results):
+        if file_records is None:
+            logger.debug("Could not parse %s", f)
+            continue
+        _merge_records(records, file_records)
+        logger.debug("Parsed %s", f)
+
+    return records
+
+
+def _describe(node: Node, rec: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    # Resolved once, shared by nodes that are both class and property
+    if "label" not in rec:
+        annotations = rec["annotations"]
+        rec["label"] = _first_annotation(node, annotations, LABEL_PREDICATES)
+        rec["comment"] = _first_annotation(node, annotations, COMMENT_PREDICATES)
+    return rec["label"], rec["comment"]
+
+
+def _stream_records(
+    records: Dict[Node, Dict[str, Any]],
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Yield (section, uri, entry) for classes, then properties, then
+    individuals, building each entry only when it is consumed.
+    """
+
+    # Classify subjects from their collected rdf:type values, in URI order:
+    # triple order depends on the store and on the parse cache
+    class_nodes: List[Node] = []
+    property_nodes: List[Node] = []
+    individual_nodes: List[Node] = []
+    for node, rec in sorted(records.items(), key=lambda item: str(item[0])):
+        types = rec["types"]
+        if not types:
+            continue
 
-def extract_tree(graph: Graph) -> Dict[str, Any]:
-    """Extract classes, properties, individuals from an RDF graph."""
-    classes: Dict[str, Any] = {}
-    properties: Dict[str, Any] = {}
-    individuals: Dict[str, Any] = {}
+        is_class = OWL.Class in types
+        is_property = not PROPERTY_TYPES.isdisjoint(types)
+        if is_class:
+            class_nodes.append(node)
+        if is_property:
+            property_nodes.append(node)
+        # skip classes & properties
+        if isinstance(node, URIRef) and not is_class and not is_property:
+            individual_nodes.append(node)
 
     # ---------------- CLASSES ----------------
-    for cls in graph.subjects(RDF.type, OWL.Class):
-        uri = str(cls)
-        classes[uri] = {
-            "label": get_label(graph, cls),
-            "comment": get_comment(graph, cls),
-            "parents": [str(o) for o in graph.objects(cls, RDFS.subClassOf)],
+    for node in class_nodes:
+        rec = records[node]
+        label, comment = _describe(node, rec)
+        yield "classes", str(node), {
+            "label": label,
+            "comment": comment,
+            "parents": sorted(str(o) for o in rec["parents"]),
         }
 
     # ---------------- PROPERTIES ----------------
-    prop_types = {
-        RDF.Property,
-        OWL.ObjectProperty,
-        OWL.DatatypeProperty,
-        OWL.AnnotationProperty,
-    }
-
-    for ptype in prop_types:
-        for p in graph.subjects(RDF.type, ptype):
-            uri = str(p)
-            properties[uri] = {
-                "label": get_label(graph, p),
-                "comment": get_comment(graph, p),
-                "domain": [str(o) for o in graph.objects(p, RDFS.domain)],
-                "range": [str(o) for o in graph.objects(p, RDFS.range)],
-            }
+    for node in property_nodes:
+        rec = records[node]
+        label, comment = _describe(node, rec)
+        yield "properties", str(node), {
+            "label": label,
+            "comment": comment,
+            "domain": sorted(str(o) for o in rec["domain"]),
+            "range": sorted(str(o) for o in rec["range"]),
+        }
 
     # ---------------- INDIVIDUALS ----------------
-    for s, _, o in graph.triples((None, RDF.type, None)):
-        if isinstance(s, URIRef):
-            uri = str(s)
-            # skip classes & properties
-            if uri not in classes and uri not in properties:
-                individuals[uri] = {
-                    "types": [str(t) for t in graph.objects(s, RDF.type)]
-                }
+    for node in individual_nodes:
+        yield "individuals", str(node), {
+            "types": sorted(str(t) for t in records[node]["types"])
+        }
+
+
+def _inputs_path(output_file: Path) -> Path:
+    # ontology-tree.yaml -> ontology-tree.inputs.json
+    return output_file.with_suffix(".inputs.json")
+
+
+def _input_fingerprint(files: List[Path]) -> List[List[Any]]:
+    """[name, mtime_ns, size] of every input file, in a stable order."""
+    fingerprint: List[List[Any]] = []
+    for f in sorted(files):
+        st = f.stat()
+        fingerprint.append([f.name, st.st_mtime_ns, st.st_size])
+    return fingerprint
 
-    return {
-        "classes": classes,
-        "properties": properties,
-        "individuals": individuals,
-    }
+
+def _is_up_to_date(output_file: Path, fingerprint: List[List[Any]]) -> bool:
+    """
+    True if `output_file` exists and was built from exactly the inputs in
+    `fingerprint`. Any added, deleted or changed file triggers a rebuild,
+    including files copied in with older preserved mtimes.
+    """
+    if not output_file.exists():
+        return False
+    try:
+        with _inputs_path(output_file).open("r", encoding="utf-8") as f:
+            recorded: Optional[List[List[Any]]] = json.load(f).get("inputs")
+    except (OSError, ValueError, AttributeError):
+        return False
+    return recorded == fingerprint
+
+
+def _list_folder(folder: Path) -> List[Path]:
+    """
+    Ontology files in `folder`. Parse caches left behind by deleted or
+    renamed files are removed along the way.
+    """
+    files: List[Path] = []
+    caches: List[Path] = []
+    with os.scandir(folder) as it:
+        for e in it:
+            if not e.is_file():
+                continue
+            if e.name.endswith(CACHE_SUFFIX):
+                caches.append(Path(e.path))
+            elif file_suffix(e.name) in SUPPORTED_SUFFIXES:
+                files.append(Path(e.path))
+
+    sources = {f.name for f in files}
+    for cache in caches:
+        if cache.name[: -len(CACHE_SUFFIX)] in sources:
+            continue
+        try:
+            cache.unlink()
+            logger.debug("Removed orphan parse cache %s", cache)
+        except OSError as exc:
+            logger.debug("Could not remove parse cache %s: %s", cache, exc)
+
+    return files
+
+
+def _process_folder(folder: Path, use_cache: bool = True, parallel: bool = True) -> None:
+    """Write ontology-tree.yaml for one ontology folder."""
+    logger.debug("Processing ontology folder: %s", folder)
+
+    try:
+        files = _list_folder(folder)
+    except Exception as exc:
+        logger.error("Could not list files in %s: %s", folder, exc)
+        return
+
+    if not files:
+        logger.debug("No ontology files found in %s", folder)
+        return
+
+    # Written inside the ontology folder itself
+    output_file = folder / "ontology-tree.yaml"
+
+    # Skip the folder if its inputs are exactly those the existing tree was
+    # built from. Taken before parsing, so files changed meanwhile are
+    # picked up by the next run.
+    try:
+        fingerprint: Optional[List[List[Any]]] = _input_fingerprint(files)
+    except OSError as exc:
+        logger.debug("Could not stat inputs of %s: %s", folder, exc)
+        fingerprint = None
+
+    if use_cache and fingerprint is not None and _is_up_to_date(output_file, fingerprint):
+        logger.debug("Ontology tree is up to date: %s", output_file)
+        return
+
+    # Files are reduced to tree records one at a time, so the folder's
+    # merged graph is never held in memory
+    try:
+        records = load_records(files, use_cache, parallel)
+    except Exception as exc:
+        logger.error("Failed to load RDF from %s: %s", folder, exc)
+        return
+
+    # Stream entries to disk instead of building the whole tree first
+    try:
+        write_yaml_sections(output_file, TREE_SECTIONS, _stream_records(records))
+        logger.debug("Wrote ontology tree → %s", output_file)
+    except Exception as exc:
+        logger.error("Failed to write ontology tree to %s: %s", output_file, exc)
+        return
+
+    inputs_file = _inputs_path(output_file)
+    try:
+        if fingerprint is None:
+            inputs_file.unlink(missing_ok=True)
+        else:
+            write_json_file(inputs_file, {"inputs": fingerprint})
+    except OSError as exc:
+        logger.debug("Could not record inputs in %s: %s", inputs_file, exc)
 
 
 def generate_ontology_tree(
     ontologies_dir: Path,
     folder_filters: Optional[List[str]],
     verbose: bool,
+    use_cache: bool = True,
 ) -> None:
     """Generate one ontology-tree.yaml per ontology folder."""
     setup_cli_logging(verbose)
@@ -164,42 +544,16 @@ def generate_ontology_tree(
         logger.error("No ontology folders matched filters: %s", folder_filters)
         raise typer.Exit(1)
 
-    for folder in folders:
-        logger.debug("Processing ontology folder: %s", folder)
-
-        try:
-            files = [
-                f
-                for f in folder.iterdir()
-                if f.is_file() and f.suffix.lower() in SUPPORTED_SUFFIXES
-            ]
-        except Exception as exc:
-            logger.error("Could not list files in %s: %s", folder, exc)
-            continue
-
-        if not files:
-            logger.debug("No ontology files found in %s", folder)
-            continue
-
-        try:
-            graph = load_graph(files)
-        except Exception as exc:
-            logger.error("Failed to load RDF from %s: %s", folder, exc)
-            continue
-
-        try:
-            tree = extract_tree(graph)
-        except Exception as exc:
-            logger.error("Failed to extract tree for %s: %s", folder, exc)
-            continue
-
-        # Write inside the ontology folder itself
-        output_file = folder / "ontology-tree.yaml"
-
-        try:
-            write_yaml_file(output_file, tree)
-            logger.debug("Wrote ontology tree → %s", output_file)
-        except Exception as exc:
-            logger.error("Failed to write YAML to %s: %s", output_file, exc)
+    # Folders are independent: with several of them, process one folder per
+    # worker and parse its files serially, rather than nesting pools
+    if len(folders) > 1:
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            initializer=setup_cli_logging,
+            initargs=(verbose,),
+        ) as ex:
+            list(ex.map(_process_folder, folders, repeat(use_cache), repeat(False)))
+    else:
+        _process_folder(folders[0], use_cache)
 
     logger.debug("Ontology tree generation complete.")
@@ -1,11 +1,21 @@
 # dataset/cli/utils.py
 from __future__ import annotations
 
+import json
 import logging
-from typing import Any
+import os
+import textwrap
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Sequence, Tuple
 import yaml
 from pathlib import Path
 
+# Prefer the LibYAML-backed C implementations when available
+try:
+    from yaml import CSafeDumper as YamlDumper, CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper, SafeLoader as YamlLoader  # type: ignore[assignment]
+
 
 def setup_cli_logging(verbose: bool) -> None:
     level = logging.DEBUG if verbose else logging.INFO
@@ -18,4 +28,75 @@ def setup_cli_logging(verbose: bool) -> None:
 def write_yaml_file(path: Path, data: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True)
+        yaml.dump(data, f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
+
+
+def write_yaml_sections(
+    path: Path,
+    sections: Sequence[str],
+    entries: Iterable[Tuple[str, str, Dict[str, Any]]],
+) -> None:
+    """
+    Stream a two-level mapping ({section: {key: value}}) to YAML.
+
+    `entries` yields (section, key, value) grouped by section, in the
+    order of `sections`; sections without entries are written as {}.
+    The file is written to a temporary path and moved into place once
+    complete.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    pending = list(sections)
+
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            current = None
+            for section, key, value in entries:
+                if section != current:
+                    if section not in pending:
+                        raise ValueError(f"Unexpected or out-of-order section: {section}")
+                    # Sections skipped over have no entries
+                    while pending[0] != section:
+                        f.write(f"{pending.pop(0)}: {{}}\n")
+                    f.write(f"{pending.pop(0)}:\n")
+                    current = section
+
+                chunk = yaml.dump(
+                    {key: value}, Dumper=YamlDumper, sort_keys=False, allow_unicode=True
+                )
+                f.write(textwrap.indent(chunk, "  "))
+
+            for section in pending:
+                f.write(f"{section}: {{}}\n")
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp_path, path)
+
+
+def write_json_file(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def file_suffix(name: str) -> str:
+    """Lowercased file suffix, with the same edge cases as Path.suffix."""
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[i:].lower()
+    return ""
+
+
+@lru_cache(maxsize=None)
+def rdf_store() -> str:
+    """
+    rdflib store plugin for new graphs: the Rust-backed Oxigraph store when
+    oxrdflib is installed, the default in-memory store otherwise.
+    """
+    try:
+        import oxrdflib  # noqa: F401
+    except ImportError:
+        return "default"
+    return "Oxigraph"
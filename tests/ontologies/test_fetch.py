@@ -0,0 +1,62 @@
+"""Tests for concurrent ontology downloads."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+
+from celine.ontologies.fetch import _download_all
+
+GOOD_BODY = b"<http://a.org/x> <http://a.org/p> <http://a.org/o> .\n" * 1000
+
+
+class _BrokenStream(httpx.AsyncByteStream):
+    """Sends part of a body, then drops the connection."""
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield b"partial"
+        await asyncio.sleep(0.05)
+        raise httpx.ReadError("connection dropped")
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "a.org":
+        return httpx.Response(200, content=GOOD_BODY)
+    if request.url.host == "b.org":
+        return httpx.Response(200, content=b"other body")
+    return httpx.Response(200, stream=_BrokenStream())
+
+
+def _run(urls: list[str], subdir: Path) -> list:
+    transport = httpx.MockTransport(_handler)
+    return asyncio.run(_download_all([(url, subdir) for url in urls], transport=transport))
+
+
+# ---------------------------------------------------------------------------
+# _download_all
+# ---------------------------------------------------------------------------
+
+def test_failed_download_keeps_file_of_same_name(tmp_path: Path) -> None:
+    results = _run(["http://a.org/x/onto.ttl", "http://c.org/y/onto.ttl"], tmp_path)
+
+    assert results[0] == "onto.ttl"
+    assert isinstance(results[1], httpx.ReadError)
+    assert (tmp_path / "onto.ttl").read_bytes() == GOOD_BODY
+    assert [p.name for p in tmp_path.iterdir()] == ["onto.ttl"]
+
+
+def test_colliding_downloads_never_mix_bodies(tmp_path: Path) -> None:
+    results = _run(["http://a.org/x/", "http://b.org/y/"], tmp_path)
+
+    assert results == ["definition", "definition"]
+    assert (tmp_path / "definition").read_bytes() in (GOOD_BODY, b"other body")
+    assert [p.name for p in tmp_path.iterdir()] == ["definition"]
+
+
+def test_failed_download_leaves_no_partial_file(tmp_path: Path) -> None:
+    results = _run(["http://c.org/y/onto.ttl"], tmp_path)
+
+    assert isinstance(results[0], httpx.ReadError)
+    assert list(tmp_path.iterdir()) == []
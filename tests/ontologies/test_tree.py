@@ -0,0 +1,308 @@
+"""Tests for the ontology tree loader."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+
+from rdflib import BNode, Graph, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import RDFS
+
+from celine.ontologies.tree import (
+    CACHE_SUFFIX,
+    _file_records,
+    _list_folder,
+    _process_folder,
+    _read_ntriples,
+    _stream_records,
+)
+
+NT_DOC = r"""# leading comment line
+
+<http://ex.org/a> <http://ex.org/label> "plain" .
+<http://ex.org/a> <http://ex.org/label> "chat"@fr .
+<http://ex.org/a> <http://ex.org/label> "colour"@en-GB .
+<http://ex.org/a> <http://ex.org/count> "42"^^<http://www.w3.org/2001/XMLSchema#integer> .
+<http://ex.org/a> <http://ex.org/note> "say \"hi\"\tthen\nbreak \\ café \U0001F600" .
+<http://ex.org/a> <http://ex.org/rel> _:b0 .
+_:b0 <http://ex.org/rel> _:b1 .
+_:b1 <http://ex.org/label> "nested" .
+<http://ex.org/b> <http://ex.org/rel> <http://ex.org/a> . # trailing comment
+<http://ex.org/b>   <http://ex.org/label>   "spaced"   .
+"""
+
+TTL_DOC = """@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+<http://ex.org/a> rdfs:label "{label}" .
+"""
+
+NODE_A = URIRef("http://ex.org/a")
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _write(tmp_path: Path, text: str) -> Path:
+    path = tmp_path / "doc.nt"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _write_ttl(tmp_path: Path, label: str) -> Path:
+    path = tmp_path / "doc.ttl"
+    path.write_text(TTL_DOC.format(label=label), encoding="utf-8")
+    return path
+
+
+def _label(path: Path) -> str:
+    records = _file_records(path)
+    assert records is not None
+    return str(records[NODE_A]["annotations"][RDFS.label])
+
+
+def _graph(triples: list) -> Graph:
+    g = Graph()
+    for t in triples:
+        g.add(t)
+    return g
+
+
+# ---------------------------------------------------------------------------
+# _read_ntriples
+# ---------------------------------------------------------------------------
+
+def test_read_ntriples_matches_rdflib(tmp_path: Path) -> None:
+    path = _write(tmp_path, NT_DOC)
+    triples = _read_ntriples(path)
+    assert triples is not None
+    assert isomorphic(_graph(triples), Graph().parse(path, format="nt"))
+
+
+def test_read_ntriples_reuses_blank_nodes(tmp_path: Path) -> None:
+    path = _write(tmp_path, NT_DOC)
+    triples = _read_ntriples(path)
+    assert triples is not None
+    bnodes = {n for t in triples for n in t if isinstance(n, BNode)}
+    assert len(bnodes) == 2
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        # Escaped IRI: valid N-Triples left to rdflib's parser
+        r'<http://ex.org/\u0061> <http://ex.org/p> "x" .',
+        '<http://ex.org/a> <http://ex.org/p> "x" . trailing garbage',
+    ],
+)
+def test_read_ntriples_falls_back_on_unrecognised_line(tmp_path: Path, line: str) -> None:
+    path = _write(tmp_path, NT_DOC + line + "\n")
+    assert _read_ntriples(path) is None
+
+
+def test_escaped_iri_fallback_is_valid_ntriples(tmp_path: Path) -> None:
+    path = _write(tmp_path, r'<http://ex.org/\u0061> <http://ex.org/p> "x" .' + "\n")
+    assert len(Graph().parse(path, format="nt")) == 1
+
+
+# ---------------------------------------------------------------------------
+# _file_records
+# ---------------------------------------------------------------------------
+
+def test_unsupported_suffix_is_refused(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    path = tmp_path / "doc.xsd"
+    path.write_text(TTL_DOC.format(label="x"), encoding="utf-8")
+
+    assert _file_records(path) is None
+    assert "unsupported suffix: .xsd" in caplog.text
+    assert list(tmp_path.iterdir()) == [path]
+
+
+# ---------------------------------------------------------------------------
+# Annotation and list order
+# ---------------------------------------------------------------------------
+
+LABELS_TTL = """@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+<http://ex.org/A> a owl:Class ;
+    rdfs:label {labels} ;
+    rdfs:subClassOf {parents} .
+"""
+
+
+def _tree(tmp_path: Path, labels: str, parents: str) -> list:
+    path = tmp_path / "labels.ttl"
+    path.write_text(LABELS_TTL.format(labels=labels, parents=parents), encoding="utf-8")
+    records = _file_records(path, use_cache=False)
+    assert records is not None
+    return list(_stream_records(records))
+
+
+@pytest.mark.parametrize(
+    "labels, expected",
+    [
+        ('"Valutazione"@it, "Evaluation"@en', "Evaluation"),
+        ('"Evaluation"@en, "Valutazione"@it', "Evaluation"),
+        ('"Evaluation"@en-GB, "Plain", "Valutazione"@it', "Plain"),
+        ('"Zeta"@it, "Alpha"@de', "Alpha"),
+        ('""@en, "Valutazione"@it', "Valutazione"),
+    ],
+)
+def test_label_choice_ignores_triple_order(tmp_path: Path, labels: str, expected: str) -> None:
+    [(section, uri, entry)] = _tree(tmp_path, labels, "<http://ex.org/P>")
+    assert entry["label"] == expected
+
+
+def test_lists_are_sorted(tmp_path: Path) -> None:
+    forward = _tree(tmp_path, '"A"', "<http://ex.org/P1>, <http://ex.org/P2>")
+    backward = _tree(tmp_path, '"A"', "<http://ex.org/P2>, <http://ex.org/P1>")
+    assert forward == backward
+    assert forward[0][2]["parents"] == ["http://ex.org/P1", "http://ex.org/P2"]
+
+
+def test_tree_does_not_depend_on_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("oxrdflib")
+    labels, parents = '"Valutazione"@it, "Evaluation"@en', "<http://ex.org/P2>, <http://ex.org/P1>"
+
+    monkeypatch.setattr("celine.ontologies.tree.rdf_store", lambda: "default")
+    default = _tree(tmp_path, labels, parents)
+    monkeypatch.setattr("celine.ontologies.tree.rdf_store", lambda: "Oxigraph")
+    assert _tree(tmp_path, labels, parents) == default
+
+
+# ---------------------------------------------------------------------------
+# Parse cache
+# ---------------------------------------------------------------------------
+
+def test_parse_writes_cache_with_source_header(tmp_path: Path) -> None:
+    path = _write_ttl(tmp_path, "first")
+    assert _label(path) == "first"
+
+    cache = tmp_path / ("doc.ttl" + CACHE_SUFFIX)
+    header = cache.read_text(encoding="utf-8").splitlines()[0]
+    assert f"size={path.stat().st_size}" in header
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_fresh_cache_is_read_instead_of_source(tmp_path: Path) -> None:
+    path = _write_ttl(tmp_path, "first")
+    _file_records(path)
+
+    # Edit the cache only: a fresh cache is trusted over the source
+    cache = tmp_path / ("doc.ttl" + CACHE_SUFFIX)
+    cache.write_text(
+        cache.read_text(encoding="utf-8").replace('"first"', '"cached"'),
+        encoding="utf-8",
+    )
+    assert _label(path) == "cached"
+
+
+def test_stale_cache_is_reparsed_and_rewritten(tmp_path: Path) -> None:
+    path = _write_ttl(tmp_path, "first")
+    _file_records(path)
+
+    path = _write_ttl(tmp_path, "second, longer")
+    assert _label(path) == "second, longer"
+
+    cache = tmp_path / ("doc.ttl" + CACHE_SUFFIX)
+    assert '"second, longer"' in cache.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("store", ["default", "Oxigraph"])
+def test_cache_hit_gives_same_tree_as_fresh_parse(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, store: str
+) -> None:
+    if store == "Oxigraph":
+        pytest.importorskip("oxrdflib")
+    monkeypatch.setattr("celine.ontologies.tree.rdf_store", lambda: store)
+
+    path = tmp_path / "labels.ttl"
+    path.write_text(
+        LABELS_TTL.format(
+            labels='"Valutazione"@it, "Evaluation"@en, "Évaluation"@fr, "Bewertung"@de',
+            parents="<http://ex.org/P3>, <http://ex.org/P1>, <http://ex.org/P2>",
+        ),
+        encoding="utf-8",
+    )
+    fresh = _file_records(path, use_cache=False)
+    assert fresh is not None
+
+    _file_records(path)
+    cached = _file_records(path)
+    assert cached is not None
+    assert (tmp_path / ("labels.ttl" + CACHE_SUFFIX)).exists()
+
+    assert cached == fresh
+    assert list(_stream_records(cached)) == list(_stream_records(fresh))
+
+
+def test_no_cache_leaves_folder_untouched(tmp_path: Path) -> None:
+    path = _write_ttl(tmp_path, "first")
+    assert _file_records(path, use_cache=False) is not None
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_list_folder_removes_orphan_caches(tmp_path: Path) -> None:
+    path = _write_ttl(tmp_path, "first")
+    _file_records(path)
+    orphan = tmp_path / ("gone.owl" + CACHE_SUFFIX)
+    orphan.write_text("", encoding="utf-8")
+
+    assert _list_folder(tmp_path) == [path]
+    assert not orphan.exists()
+    assert (tmp_path / ("doc.ttl" + CACHE_SUFFIX)).exists()
+
+
+# ---------------------------------------------------------------------------
+# Up-to-date check
+# ---------------------------------------------------------------------------
+
+def _classes(folder: Path) -> set[str]:
+    _process_folder(folder, parallel=False)
+    tree = yaml.safe_load((folder / "ontology-tree.yaml").read_text(encoding="utf-8"))
+    return set(tree["classes"])
+
+
+def _write_class(folder: Path, name: str) -> Path:
+    path = folder / f"{name}.ttl"
+    path.write_text(
+        "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+        f"<http://ex.org/{name}> a owl:Class .\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_tree_is_rebuilt_when_an_input_is_deleted(tmp_path: Path) -> None:
+    _write_class(tmp_path, "A")
+    b = _write_class(tmp_path, "B")
+    assert _classes(tmp_path) == {"http://ex.org/A", "http://ex.org/B"}
+
+    b.unlink()
+    assert _classes(tmp_path) == {"http://ex.org/A"}
+
+
+def test_tree_is_rebuilt_for_inputs_with_older_mtime(tmp_path: Path) -> None:
+    a = _write_class(tmp_path, "A")
+    assert _classes(tmp_path) == {"http://ex.org/A"}
+
+    # Same name, different content, mtime preserved from the past (cp -p)
+    a.write_text(
+        "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+        "<http://ex.org/Z> a owl:Class .\n",
+        encoding="utf-8",
+    )
+    os.utime(a, ns=(1_000_000_000, 1_000_000_000))
+    assert _classes(tmp_path) == {"http://ex.org/Z"}
+
+
+def test_unchanged_tree_is_skipped(tmp_path: Path) -> None:
+    _write_class(tmp_path, "A")
+    _classes(tmp_path)
+    output = tmp_path / "ontology-tree.yaml"
+    mtime = output.stat().st_mtime_ns
+
+    assert _classes(tmp_path) == {"http://ex.org/A"}
+    assert output.stat().st_mtime_ns == mtime